@@ -4,10 +4,50 @@
 Usage:
     python visualize_graph.py /tmp/sm_export/nav_graph.json -o graph.html
     python visualize_graph.py /tmp/sm_export/nav_graph.json  # writes sm_nav_graph.html
+    python visualize_graph.py /tmp/sm_export/nav_graph.json --split-data  # + .bin/.strings.json
+    python visualize_graph.py /tmp/sm_export/nav_graph.json --compress gzip  # + .html.gz
 """
 import argparse
+import base64
+import gzip
 import json
-import html
+import os
+import re
+import struct
+from typing import Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+
+def _dumps(value) -> str:
+    """Compact JSON; uses orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(value).decode("utf-8")
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def _script_json(value) -> str:
+    """_dumps for embedding in a <script> element.
+
+    "<" only occurs inside JSON strings, where \\u003c means the same thing,
+    so escaping every one keeps data from closing the element or opening a
+    "<!--" comment state in it.
+    """
+    return _dumps(value).replace("<", "\\u003c")
+
 
 # Area colors matching the game's aesthetic
 AREA_COLORS = {
@@ -28,410 +68,248 @@ DOOR_CAP_COLORS = {
     "grey": "#808088",
 }
 
-
-def build_html(graph_path: str) -> str:
-    with open(graph_path) as f:
-        data = json.load(f)
-
-    nodes = data["nodes"]
-    edges = data["edges"]
-
-    # Build node lookup
-    node_by_id = {n["roomId"]: n for n in nodes}
-
-    # Build adjacency info per node for hover detail
-    adj = {}  # roomId -> list of (destName, direction, cap)
+# Packed graph buffer, see pack_graph()
+GRAPH_MAGIC = b"SMNG"
+GRAPH_VERSION = 1
+
+# Edge flag bits in the packed edge flags section
+EDGE_FLAG_CAP = 1
+EDGE_FLAG_ELEVATOR = 2
+
+# Viewer page; build_html fills each /*__NAME__*/ placeholder
+TEMPLATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "visualize_graph_template.html")
+PLACEHOLDER_RE = re.compile(r"/\*__([A-Z_]+)__\*/")
+
+
+def color_to_u32(color: str) -> int:
+    """Convert '#rgb' or '#rrggbb' to 0xRRGGBB."""
+    h = color.lstrip("#")
+    if len(h) == 3:
+        h = "".join(c * 2 for c in h)
+    return int(h, 16)
+
+
+def pack_array(fmt: str, values: list) -> bytes:
+    """Pack values as a little-endian typed array section (struct format char)."""
+    return struct.pack(f"<{len(values)}{fmt}", *values)
+
+
+def _stream_items(graph_path: str, prefix: str):
+    with open(graph_path, "rb") as f:
+        yield from ijson.items(f, prefix, use_float=True)
+
+
+def read_graph(graph_path: str) -> tuple:
+    """Return (nodes, edges) iterables for a nav_graph.json file.
+
+    With ijson installed both are streamed, one pass over the file each, so
+    the parsed graph is never held in memory as a whole; nodes must be
+    consumed before edges. Otherwise the file is loaded with json.load.
+    """
+    if ijson is None:
+        with open(graph_path) as f:
+            data = json.load(f)
+        return data["nodes"], data["edges"]
+    return _stream_items(graph_path, "nodes.item"), _stream_items(graph_path, "edges.item")
+
+
+def pack_graph(graph_path: str) -> tuple[bytes, list, dict]:
+    """Pack the nav graph for the viewer.
+
+    Returns (buffer, area_names, strings). The buffer is a 20-byte header
+    (magic, version, node count, edge count, door count; u32 each) followed by
+    little-endian struct-of-arrays sections, 4-byte types first so every
+    section can be viewed as a typed array in place:
+
+        f32 node x, f32 node y, u32 node id,
+        f32 edge from x, from y, to x, to y, u32 edge color,
+        u32 edge from node, u32 edge to node,
+        u8 node width, u8 node height, u8 node area, u8 edge width, u8 edge flags
+
+    Node area is an index into area_names. strings holds the per-node names,
+    room id hex strings and door lists, which the page only needs on demand.
+    """
+    nodes, edges = read_graph(graph_path)
+
+    # Nodes: one pass into flat per-field arrays, assigning area indices
+    area_names = list(AREA_COLORS)
+    area_index = {a: i for i, a in enumerate(area_names)}
+    node_index = {}
+    node_x, node_y, node_id = [], [], []
+    node_w, node_h, node_area = [], [], []
+    names, hexes = [], []
+    for i, n in enumerate(nodes):
+        area = n["areaName"]
+        idx = area_index.get(area)
+        if idx is None:
+            idx = area_index[area] = len(area_names)
+            area_names.append(area)
+        node_index[n["roomId"]] = i
+        node_x.append(n["mapX"] * 40)
+        node_y.append(n["mapY"] * 40)
+        node_id.append(n["roomId"])
+        node_w.append(n["widthScreens"])
+        node_h.append(n["heightScreens"])
+        node_area.append(idx)
+        names.append(n["name"])
+        hexes.append(n["roomIdHex"])
+
+    # Edges: one pass builds both the packed arrays and the per-node door
+    # lists for the tooltip, which the page formats on first hover. In a door
+    # entry "to" is the destination node index, or its hex id when the room
+    # is not in the graph; cap/elevator are only present when set. Doors into
+    # rooms missing from the graph are not drawn.
+    cap_colors = {cap: color_to_u32(c) for cap, c in DOOR_CAP_COLORS.items()}
+    no_cap_color = color_to_u32("#555")
+    unknown_cap_color = color_to_u32("#888")
+    node_index_get = node_index.get
+    cap_color_get = cap_colors.get
+    conns = [[] for _ in node_id]
+    door_count = 0
+    edge_fx, edge_fy, edge_tx, edge_ty = [], [], [], []
+    edge_color, edge_width, edge_flags = [], [], []
+    edge_from, edge_to = [], []
     for e in edges:
-        fid = e["fromRoomId"]
-        tid = e["toRoomId"]
-        to_node = node_by_id.get(tid)
-        to_name = to_node["name"] if to_node else e["toRoomIdHex"]
-        adj.setdefault(fid, []).append({
-            "to": to_name,
-            "dir": e["direction"],
-            "cap": e["doorCapColor"],
-            "ability": e["requiredAbility"],
-            "elevator": e["isElevator"],
-        })
-
-    # JSON data for the HTML
-    js_nodes = []
-    for n in nodes:
-        connections = adj.get(n["roomId"], [])
-        conn_html_parts = []
-        for c in connections:
-            cap_str = ""
-            if c["cap"]:
-                cap_color = DOOR_CAP_COLORS.get(c["cap"], "#fff")
-                cap_str = f' <span style="color:{cap_color};font-weight:bold">[{c["cap"]}]</span>'
-            elev = " (elevator)" if c["elevator"] else ""
-            conn_html_parts.append(f'{c["dir"]} → {html.escape(c["to"])}{cap_str}{elev}')
-
-        tooltip = (
-            f'<b>{html.escape(n["name"])}</b><br>'
-            f'{html.escape(n["areaName"])} | {n["roomIdHex"]}<br>'
-            f'Map: ({n["mapX"]}, {n["mapY"]}) | Size: {n["widthScreens"]}x{n["heightScreens"]}<br>'
-            f'<hr style="margin:4px 0">'
-            + "<br>".join(conn_html_parts) if conn_html_parts else "No doors"
-        )
-
-        js_nodes.append({
-            "id": n["roomId"],
-            "label": n["name"],
-            "area": n["areaName"],
-            "color": AREA_COLORS.get(n["areaName"], "#888"),
-            "x": n["mapX"] * 40,
-            "y": n["mapY"] * 40,
-            "w": n["widthScreens"],
-            "h": n["heightScreens"],
-            "hex": n["roomIdHex"],
-            "tooltip": tooltip,
-        })
-
-    js_edges = []
-    for e in edges:
-        color = "#555"
-        width = 1
-        if e["doorCapColor"]:
-            color = DOOR_CAP_COLORS.get(e["doorCapColor"], "#888")
+        door_count += 1
+        fi = node_index_get(e["fromRoomId"])
+        ti = node_index_get(e["toRoomId"])
+        cap = e["doorCapColor"]
+        elevator = e["isElevator"]
+        if fi is not None:
+            conn = {
+                "to": e["toRoomIdHex"] if ti is None else ti,
+                "dir": e["direction"],
+            }
+            if cap:
+                conn["cap"] = cap
+            if elevator:
+                conn["elevator"] = True
+            conns[fi].append(conn)
+        if fi is None or ti is None:
+            continue
+        if cap:
+            color = cap_color_get(cap, unknown_cap_color)
             width = 2
-        if e["isElevator"]:
+            flags = EDGE_FLAG_CAP
+        else:
+            color = no_cap_color
+            width = 1
+            flags = 0
+        if elevator:
             width = 3
-        js_edges.append({
-            "from": e["fromRoomId"],
-            "to": e["toRoomId"],
-            "color": color,
-            "width": width,
-            "cap": e["doorCapColor"],
-            "dir": e["direction"],
-        })
-
-    nodes_json = json.dumps(js_nodes)
-    edges_json = json.dumps(js_edges)
-    areas_json = json.dumps(AREA_COLORS)
-
-    return f"""<!DOCTYPE html>
-<html>
-<head>
-<meta charset="utf-8">
-<title>Super Metroid Navigation Graph</title>
-<style>
-* {{ margin: 0; padding: 0; box-sizing: border-box; }}
-body {{ background: #0a0a14; color: #ccc; font-family: 'Consolas', 'Monaco', monospace; overflow: hidden; }}
-#canvas {{ display: block; cursor: grab; }}
-#canvas.dragging {{ cursor: grabbing; }}
-#tooltip {{
-    display: none; position: fixed; background: #1a1a2e; border: 1px solid #444;
-    padding: 8px 12px; border-radius: 6px; font-size: 12px; line-height: 1.5;
-    pointer-events: none; z-index: 100; max-width: 350px;
-    box-shadow: 0 4px 12px rgba(0,0,0,0.6);
-}}
-#tooltip hr {{ border-color: #444; }}
-#controls {{
-    position: fixed; top: 10px; left: 10px; z-index: 50;
-    background: #1a1a2e; border: 1px solid #333; border-radius: 6px;
-    padding: 10px; font-size: 12px;
-}}
-#controls label {{ display: block; margin: 3px 0; cursor: pointer; }}
-#controls label:hover {{ color: #fff; }}
-#legend {{
-    position: fixed; bottom: 10px; left: 10px; z-index: 50;
-    background: #1a1a2e; border: 1px solid #333; border-radius: 6px;
-    padding: 10px; font-size: 11px;
-}}
-.legend-item {{ display: flex; align-items: center; gap: 6px; margin: 2px 0; }}
-.legend-swatch {{ width: 14px; height: 14px; border-radius: 3px; flex-shrink: 0; }}
-.legend-line {{ width: 20px; height: 0; flex-shrink: 0; }}
-#stats {{
-    position: fixed; top: 10px; right: 10px; z-index: 50;
-    background: #1a1a2e; border: 1px solid #333; border-radius: 6px;
-    padding: 10px; font-size: 12px; text-align: right;
-}}
-#search {{
-    background: #111; color: #ccc; border: 1px solid #444; border-radius: 4px;
-    padding: 4px 8px; width: 160px; font-size: 12px; margin-bottom: 6px;
-    font-family: inherit;
-}}
-#search:focus {{ outline: none; border-color: #4488cc; }}
-</style>
-</head>
-<body>
-<canvas id="canvas"></canvas>
-<div id="tooltip"></div>
-<div id="controls">
-    <input id="search" type="text" placeholder="Search rooms...">
-    <div style="margin-bottom:6px;font-weight:bold;">Areas</div>
-</div>
-<div id="legend">
-    <div style="font-weight:bold;margin-bottom:4px;">Door Caps</div>
-    <div class="legend-item"><div class="legend-line" style="border-top:2px solid #3880D0"></div> Blue (beam)</div>
-    <div class="legend-item"><div class="legend-line" style="border-top:2px solid #D05050"></div> Red (missile)</div>
-    <div class="legend-item"><div class="legend-line" style="border-top:2px solid #40C048"></div> Green (super)</div>
-    <div class="legend-item"><div class="legend-line" style="border-top:2px solid #D8C830"></div> Yellow (PB)</div>
-    <div class="legend-item"><div class="legend-line" style="border-top:2px solid #808088"></div> Grey (boss)</div>
-    <div class="legend-item"><div class="legend-line" style="border-top:1px solid #555"></div> No cap</div>
-    <div class="legend-item"><div class="legend-line" style="border-top:3px dashed #aaa"></div> Elevator</div>
-</div>
-<div id="stats"></div>
-<script>
-const NODES = {nodes_json};
-const EDGES = {edges_json};
-const AREA_COLORS = {areas_json};
-
-const canvas = document.getElementById('canvas');
-const ctx = canvas.getContext('2d');
-const tooltip = document.getElementById('tooltip');
-const statsEl = document.getElementById('stats');
-const searchEl = document.getElementById('search');
-const controlsEl = document.getElementById('controls');
-
-// Area visibility toggles
-const areaVisible = {{}};
-Object.keys(AREA_COLORS).forEach(a => {{ areaVisible[a] = true; }});
-
-Object.entries(AREA_COLORS).forEach(([area, color]) => {{
-    const label = document.createElement('label');
-    const cb = document.createElement('input');
-    cb.type = 'checkbox';
-    cb.checked = true;
-    cb.addEventListener('change', () => {{ areaVisible[area] = cb.checked; draw(); }});
-    const swatch = document.createElement('span');
-    swatch.style.cssText = `display:inline-block;width:10px;height:10px;background:${{color}};border-radius:2px;margin:0 4px;vertical-align:middle;`;
-    label.appendChild(cb);
-    label.appendChild(swatch);
-    label.appendChild(document.createTextNode(area));
-    controlsEl.appendChild(label);
-}});
-
-// State
-let camX = 0, camY = 0, zoom = 1.0;
-let dragging = false, dragStartX = 0, dragStartY = 0, dragCamX = 0, dragCamY = 0;
-let hoveredNode = null;
-let searchTerm = '';
-let highlightedNodes = new Set();
-
-const nodeById = {{}};
-NODES.forEach(n => {{ nodeById[n.id] = n; }});
-
-// Stats
-statsEl.innerHTML = `${{NODES.length}} rooms | ${{EDGES.length}} doors`;
-
-function resize() {{
-    canvas.width = window.innerWidth;
-    canvas.height = window.innerHeight;
-    draw();
-}}
-
-function worldToScreen(wx, wy) {{
-    return [
-        (wx - camX) * zoom + canvas.width / 2,
-        (wy - camY) * zoom + canvas.height / 2,
-    ];
-}}
-
-function screenToWorld(sx, sy) {{
-    return [
-        (sx - canvas.width / 2) / zoom + camX,
-        (sy - canvas.height / 2) / zoom + camY,
-    ];
-}}
-
-function nodeRadius(n) {{
-    return Math.max(4, Math.min(n.w, n.h) * 2 + 3);
-}}
-
-function draw() {{
-    ctx.clearRect(0, 0, canvas.width, canvas.height);
-
-    // Edges
-    for (const e of EDGES) {{
-        const fromN = nodeById[e.from];
-        const toN = nodeById[e.to];
-        if (!fromN || !toN) continue;
-        if (!areaVisible[fromN.area] && !areaVisible[toN.area]) continue;
-
-        const [x1, y1] = worldToScreen(fromN.x, fromN.y);
-        const [x2, y2] = worldToScreen(toN.x, toN.y);
-
-        // Skip offscreen
-        const margin = 50;
-        if (Math.max(x1, x2) < -margin || Math.min(x1, x2) > canvas.width + margin) continue;
-        if (Math.max(y1, y2) < -margin || Math.min(y1, y2) > canvas.height + margin) continue;
-
-        const dimmed = (!areaVisible[fromN.area] || !areaVisible[toN.area]);
-        const highlighted = highlightedNodes.size > 0 && (highlightedNodes.has(e.from) || highlightedNodes.has(e.to));
-        const isHoverEdge = hoveredNode && (e.from === hoveredNode.id || e.to === hoveredNode.id);
-
-        ctx.beginPath();
-        ctx.moveTo(x1, y1);
-        ctx.lineTo(x2, y2);
-        ctx.strokeStyle = isHoverEdge ? '#ffffff' : (dimmed ? '#222' : e.color);
-        ctx.lineWidth = isHoverEdge ? e.width + 1 : e.width;
-        ctx.globalAlpha = dimmed ? 0.15 : (highlighted || highlightedNodes.size === 0 ? 0.5 : 0.08);
-        if (e.cap === null && !isHoverEdge) ctx.globalAlpha *= 0.5;
-        ctx.stroke();
-    }}
-
-    ctx.globalAlpha = 1;
-
-    // Nodes
-    for (const n of NODES) {{
-        if (!areaVisible[n.area]) continue;
-        const [sx, sy] = worldToScreen(n.x, n.y);
-        if (sx < -50 || sx > canvas.width + 50 || sy < -50 || sy > canvas.height + 50) continue;
-
-        const r = nodeRadius(n) * zoom;
-        const isHovered = hoveredNode && hoveredNode.id === n.id;
-        const isHighlighted = highlightedNodes.has(n.id);
-        const dimmed = highlightedNodes.size > 0 && !isHighlighted && !isHovered;
-
-        ctx.beginPath();
-        ctx.arc(sx, sy, Math.max(r, 2), 0, Math.PI * 2);
-        ctx.fillStyle = n.color;
-        ctx.globalAlpha = dimmed ? 0.15 : (isHovered ? 1 : 0.85);
-        ctx.fill();
-
-        if (isHovered) {{
-            ctx.strokeStyle = '#fff';
-            ctx.lineWidth = 2;
-            ctx.stroke();
-        }}
-
-        // Labels at sufficient zoom
-        if (zoom > 1.5 || isHovered || isHighlighted) {{
-            ctx.globalAlpha = dimmed ? 0.1 : (isHovered ? 1 : 0.8);
-            ctx.fillStyle = '#fff';
-            ctx.font = `${{Math.max(9, 11 * zoom)}}px Consolas, Monaco, monospace`;
-            ctx.textAlign = 'center';
-            ctx.fillText(n.label, sx, sy - r - 4);
-        }}
-    }}
-
-    ctx.globalAlpha = 1;
-}}
-
-// Interaction
-canvas.addEventListener('mousedown', (e) => {{
-    dragging = true;
-    dragStartX = e.clientX;
-    dragStartY = e.clientY;
-    dragCamX = camX;
-    dragCamY = camY;
-    canvas.classList.add('dragging');
-}});
-
-canvas.addEventListener('mousemove', (e) => {{
-    if (dragging) {{
-        camX = dragCamX - (e.clientX - dragStartX) / zoom;
-        camY = dragCamY - (e.clientY - dragStartY) / zoom;
-        draw();
-        return;
-    }}
-
-    const [wx, wy] = screenToWorld(e.clientX, e.clientY);
-    let closest = null;
-    let closestDist = Infinity;
-    for (const n of NODES) {{
-        if (!areaVisible[n.area]) continue;
-        const dx = n.x - wx;
-        const dy = n.y - wy;
-        const dist = Math.sqrt(dx * dx + dy * dy);
-        const hitRadius = nodeRadius(n) + 8 / zoom;
-        if (dist < hitRadius && dist < closestDist) {{
-            closestDist = dist;
-            closest = n;
-        }}
-    }}
-
-    if (closest !== hoveredNode) {{
-        hoveredNode = closest;
-        draw();
-    }}
-
-    if (closest) {{
-        tooltip.style.display = 'block';
-        tooltip.innerHTML = closest.tooltip;
-        let tx = e.clientX + 15;
-        let ty = e.clientY + 15;
-        if (tx + 300 > window.innerWidth) tx = e.clientX - 310;
-        if (ty + 200 > window.innerHeight) ty = e.clientY - 210;
-        tooltip.style.left = tx + 'px';
-        tooltip.style.top = ty + 'px';
-    }} else {{
-        tooltip.style.display = 'none';
-    }}
-}});
-
-canvas.addEventListener('mouseup', () => {{
-    dragging = false;
-    canvas.classList.remove('dragging');
-}});
-
-canvas.addEventListener('wheel', (e) => {{
-    e.preventDefault();
-    const factor = e.deltaY > 0 ? 0.9 : 1.1;
-    const [wx, wy] = screenToWorld(e.clientX, e.clientY);
-    zoom *= factor;
-    zoom = Math.max(0.1, Math.min(zoom, 20));
-    // Keep the point under mouse fixed
-    camX = wx - (e.clientX - canvas.width / 2) / zoom;
-    camY = wy - (e.clientY - canvas.height / 2) / zoom;
-    draw();
-}});
-
-// Search
-searchEl.addEventListener('input', () => {{
-    searchTerm = searchEl.value.toLowerCase().trim();
-    highlightedNodes.clear();
-    if (searchTerm.length > 0) {{
-        for (const n of NODES) {{
-            if (n.label.toLowerCase().includes(searchTerm) ||
-                n.hex.toLowerCase().includes(searchTerm) ||
-                n.area.toLowerCase().includes(searchTerm)) {{
-                highlightedNodes.add(n.id);
-            }}
-        }}
-    }}
-    draw();
-}});
-
-// Center on map
-function centerView() {{
-    if (NODES.length === 0) return;
-    let minX = Infinity, minY = Infinity, maxX = -Infinity, maxY = -Infinity;
-    for (const n of NODES) {{
-        minX = Math.min(minX, n.x);
-        minY = Math.min(minY, n.y);
-        maxX = Math.max(maxX, n.x);
-        maxY = Math.max(maxY, n.y);
-    }}
-    camX = (minX + maxX) / 2;
-    camY = (minY + maxY) / 2;
-    const spanX = maxX - minX + 100;
-    const spanY = maxY - minY + 100;
-    zoom = Math.min(canvas.width / spanX, canvas.height / spanY) * 0.85;
-    zoom = Math.max(0.3, Math.min(zoom, 5));
-}}
-
-window.addEventListener('resize', resize);
-resize();
-centerView();
-draw();
-</script>
-</body>
-</html>"""
+            flags |= EDGE_FLAG_ELEVATOR
+        edge_fx.append(node_x[fi])
+        edge_fy.append(node_y[fi])
+        edge_tx.append(node_x[ti])
+        edge_ty.append(node_y[ti])
+        edge_color.append(color)
+        edge_width.append(width)
+        edge_flags.append(flags)
+        edge_from.append(fi)
+        edge_to.append(ti)
+
+    buffer = b"".join([
+        GRAPH_MAGIC,
+        struct.pack("<IIII", GRAPH_VERSION, len(node_id), len(edge_from), door_count),
+        pack_array("f", node_x),
+        pack_array("f", node_y),
+        pack_array("I", node_id),
+        pack_array("f", edge_fx),
+        pack_array("f", edge_fy),
+        pack_array("f", edge_tx),
+        pack_array("f", edge_ty),
+        pack_array("I", edge_color),
+        pack_array("I", edge_from),
+        pack_array("I", edge_to),
+        pack_array("B", node_w),
+        pack_array("B", node_h),
+        pack_array("B", node_area),
+        pack_array("B", edge_width),
+        pack_array("B", edge_flags),
+    ])
+    strings = {"names": names, "hex": hexes, "conns": conns}
+    return buffer, area_names, strings
+
+
+def build_html(buffer: bytes, area_names: list, strings: dict, data_base: Optional[str] = None) -> str:
+    """Render the viewer page for a packed graph (see pack_graph).
+
+    By default the buffer (base64) and strings are embedded so the page is
+    self-contained. With data_base, the page instead fetches
+    <data_base>.bin and <data_base>.strings.json relative to itself.
+    """
+    if data_base is None:
+        graph_data_js = _script_json(base64.b64encode(buffer).decode("ascii"))
+        strings_element = (
+            '<script type="application/json" id="graph-strings">'
+            + _script_json(strings)
+            + "</script>"
+        )
+    else:
+        graph_data_js = "null"
+        strings_element = ""
+    # Every JSON value lands inside a script element
+    values = {
+        "GRAPH_DATA": graph_data_js,
+        "DATA_BASE": _script_json(data_base),
+        "STRINGS_ELEMENT": strings_element,
+        "AREA_NAMES": _script_json(area_names),
+        "AREA_COLORS": _script_json(AREA_COLORS),
+        "DOOR_CAP_COLORS": _script_json(DOOR_CAP_COLORS),
+        "EDGE_FLAG_CAP": str(EDGE_FLAG_CAP),
+        "GRAPH_VERSION": str(GRAPH_VERSION),
+    }
+    with open(TEMPLATE_PATH, encoding="utf-8") as f:
+        template = f.read()
+    # One pass, so placeholder-like text inside the data is never expanded
+    return PLACEHOLDER_RE.sub(lambda m: values[m.group(1)], template)
+
+
+def write_output(path: str, data: bytes, compress: str = "none") -> None:
+    """Write data to path, plus a precompressed path.gz / path.br copy.
+
+    The plain file is always written so the page still works when opened
+    directly; the compressed copy is for static servers that can send it
+    with Content-Encoding set.
+    """
+    with open(path, "wb") as f:
+        f.write(data)
+    sizes = f"{len(data)} bytes"
+    if compress == "gzip":
+        packed = gzip.compress(data, compresslevel=6, mtime=0)
+        with open(path + ".gz", "wb") as f:
+            f.write(packed)
+        sizes += f", {len(packed)} gzipped"
+    elif compress == "br":
+        packed = brotli.compress(data, quality=5)
+        with open(path + ".br", "wb") as f:
+            f.write(packed)
+        sizes += f", {len(packed)} brotli"
+    print(f"Wrote {path} ({sizes})")
 
 
 def main():
     parser = argparse.ArgumentParser(description="Visualize SM nav graph as interactive HTML")
     parser.add_argument("graph_json", help="Path to nav_graph.json")
     parser.add_argument("-o", "--output", default="sm_nav_graph.html", help="Output HTML file")
+    parser.add_argument("--split-data", action="store_true",
+                        help="Write graph data to .bin/.strings.json files next to the HTML "
+                             "instead of embedding it (the page must then be served over HTTP)")
+    parser.add_argument("--compress", choices=["none", "gzip", "br"], default="none",
+                        help="Also write a precompressed .gz/.br copy of each output file")
     args = parser.parse_args()
-
-    html_content = build_html(args.graph_json)
-    with open(args.output, "w") as f:
-        f.write(html_content)
-    print(f"Wrote {args.output} ({len(html_content)} bytes)")
+    if args.compress == "br" and brotli is None:
+        parser.error("--compress br requires the brotli package (pip install brotli)")
+
+    buffer, area_names, strings = pack_graph(args.graph_json)
+    if args.split_data:
+        base = os.path.splitext(args.output)[0]
+        write_output(base + ".bin", buffer, args.compress)
+        write_output(base + ".strings.json", _dumps(strings).encode("utf-8"), args.compress)
+        html_content = build_html(buffer, area_names, strings, data_base=os.path.basename(base))
+    else:
+        html_content = build_html(buffer, area_names, strings)
+    write_output(args.output, html_content.encode("utf-8"), args.compress)
 
 
 if __name__ == "__main__":